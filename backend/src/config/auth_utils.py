@@ -25,7 +25,8 @@ def get_token_expiry(token: str) -> Dict[str, Any]:
         if missing_padding:
             payload_b64 += '=' * (4 - missing_padding)
             
-        payload_json = base64.b64decode(payload_b64).decode('utf-8')
+        # JWT segments are base64url ('-' and '_'), which b64decode rejects
+        payload_json = base64.urlsafe_b64decode(payload_b64).decode('utf-8')
         payload = json.loads(payload_json)
         
         exp_timestamp = payload.get('exp')
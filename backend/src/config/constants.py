@@ -118,6 +118,9 @@ MAX_WEBSOCKET_SUBSCRIPTIONS = 200
 WEBSOCKET_RECONNECT_DELAY = 5  # seconds
 WEBSOCKET_MAX_RECONNECT_ATTEMPTS = 10
 WEBSOCKET_RECONNECT_JITTER = 0.5  # Add random jitter to avoid thundering herd
+WEBSOCKET_MAX_KEYS_PER_FRAME = 100  # Instrument keys per sub/unsub frame
+WEBSOCKET_SEND_QUEUE_SIZE = 1024  # Outbound requests buffered for the writer task
+WEBSOCKET_SEND_BATCH_SIZE = 32  # Requests the writer drains per wake-up
 
 # ========== DNS FALLBACK ==========
 DNS_FALLBACK_SERVERS = [
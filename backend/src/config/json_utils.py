@@ -0,0 +1,33 @@
+"""JSON helpers - uses orjson when installed, stdlib json otherwise.
+
+Both backends accept str, bytes, bytearray or memoryview in loads();
+dumps() always returns compact UTF-8 bytes so callers can write or send
+the result directly.
+"""
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+
+except ImportError:
+    import json
+
+    ORJSON_AVAILABLE = False
+
+    def loads(data: Any) -> Any:
+        """Parse JSON from str or any bytes-like object."""
+        if isinstance(data, memoryview):
+            # stdlib json rejects memoryview; orjson reads it in place
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
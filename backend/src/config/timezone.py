@@ -16,6 +16,9 @@ except AttributeError:
 
 IST_TZ = ZoneInfo('Asia/Kolkata') if ZoneInfo is not None else timezone(timedelta(hours=5, minutes=30))
 
+# IST has no DST, so a fixed offset is exact for epoch -> wall-clock math
+IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
+
 
 def ist_now() -> datetime:
     """Return the current IST datetime (timezone-aware)."""
@@ -35,3 +38,8 @@ def ist_timestamp() -> float:
 def ist_isoformat() -> str:
     """Return the current IST datetime in ISO format."""
     return ist_now().isoformat()
+
+
+def ist_clock(epoch: float) -> str:
+    """Format a Unix epoch as an IST HH:MM:SS string without building a datetime."""
+    return time.strftime('%H:%M:%S', time.gmtime(epoch + IST_OFFSET_SECONDS))
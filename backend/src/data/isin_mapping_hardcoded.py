@@ -10,6 +10,10 @@ Generated: 2025-11-30 07:23:32
 Total Symbols: 208
 """
 
+import sys
+from types import MappingProxyType
+from typing import Mapping
+
 # Complete ISIN mapping for all 208 NSE FNO symbols
 # These ISINs are required for correct LTP API calls
 ISIN_MAPPING = {
@@ -223,6 +227,18 @@ ISIN_MAPPING = {
     "ZYDUSLIFE": "INE010B01027"
 }
 
+# Intern keys and values once at import so every caller shares the same
+# string objects and dict lookups with them short-circuit on identity
+ISIN_MAPPING = {sys.intern(symbol): sys.intern(isin) for symbol, isin in ISIN_MAPPING.items()}
+
+# Read-only view handed out by get_all_isins() instead of a fresh copy
+ISIN_VIEW = MappingProxyType(ISIN_MAPPING)
+
+# Upstox instrument keys (NSE_EQ|ISIN), formatted once at import
+INSTRUMENT_KEY_MAPPING = {
+    symbol: sys.intern(f"NSE_EQ|{isin}") for symbol, isin in ISIN_MAPPING.items()
+}
+
 
 def get_isin(symbol: str) -> str:
     """Get ISIN for a symbol"""
@@ -234,9 +250,9 @@ def get_all_symbols() -> list:
     return list(ISIN_MAPPING.keys())
 
 
-def get_all_isins() -> dict:
-    """Get complete mapping"""
-    return ISIN_MAPPING.copy()
+def get_all_isins() -> Mapping[str, str]:
+    """Get complete mapping (read-only view, no copy)"""
+    return ISIN_VIEW
 
 
 def validate_symbol(symbol: str) -> bool:
@@ -246,10 +262,7 @@ def validate_symbol(symbol: str) -> bool:
 
 def get_instrument_key(symbol: str) -> str:
     """Get full instrument key for Upstox API (NSE_EQ|ISIN format)"""
-    isin = ISIN_MAPPING.get(symbol)
-    if isin:
-        return f"NSE_EQ|{isin}"
-    return None
+    return INSTRUMENT_KEY_MAPPING.get(symbol)
 
 
 # Statistics
@@ -2,7 +2,7 @@
 Main FastAPI application entry point
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import asyncio
@@ -24,6 +24,7 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("🚀 Kakarot Trading Bot starting...")
+    logger.info(f"⚙️  Event loop: {type(asyncio.get_running_loop()).__module__}")
     
     # Send Telegram notification
     telegram = get_telegram_service(settings)
@@ -193,19 +194,32 @@ async def get_subscriptions():
 
 
 @app.get("/api/v1/websocket/latest-ticks")
-async def get_latest_ticks():
-    """Get latest tick data for all subscribed symbols"""
+async def get_latest_ticks(request: Request, response: Response):
+    """
+    Get latest tick data for all subscribed symbols
+    
+    Supports conditional requests: the ETag changes whenever a tick is
+    aggregated, so pollers sending If-None-Match get an empty 304 until
+    there is new data.
+    """
     from .websocket.handlers import get_aggregated_handler
 
     handler = get_aggregated_handler()
     if not handler:
         return {"error": "Handlers not initialized"}, 503
 
+    # id() distinguishes handler instances so counters restarting at 0 don't collide
+    etag = f'"{id(handler):x}-{handler.price_updates}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return handler.get_stats()
 
 
 if __name__ == "__main__":
     import uvicorn
+    # loop="auto" (the default) already picks uvloop when it is installed
     uvicorn.run(
         app,
         host="0.0.0.0",
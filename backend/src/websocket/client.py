@@ -11,15 +11,15 @@ CRITICAL: V3 requires:
 """
 
 import asyncio
-import json
+import functools
 import websockets
 import aiohttp
-from typing import Optional, Callable, List, Dict, Any
-from datetime import datetime
+from typing import Optional, Callable, List, Dict, Any, Union
 import logging
 import traceback
 import time
 import random
+import secrets
 import socket
 
 from ..config.settings import settings
@@ -28,12 +28,15 @@ from ..config.constants import (
     WEBSOCKET_RECONNECT_DELAY,
     WEBSOCKET_MAX_RECONNECT_ATTEMPTS,
     WEBSOCKET_RECONNECT_JITTER,
+    WEBSOCKET_MAX_KEYS_PER_FRAME,
+    WEBSOCKET_SEND_QUEUE_SIZE,
+    WEBSOCKET_SEND_BATCH_SIZE,
     CONNECTION_RETRY_TIMEOUT,
     DNS_FALLBACK_SERVERS,
     DNS_TIMEOUT
 )
 from ..config.logging import websocket_logger as logger
-from ..config.timezone import ist_now
+from ..config.json_utils import dumps, loads
 from ..notifications.telegram import get_telegram_service
 from .data_models import TickData, SubscriptionRequest, UnsubscriptionRequest
 from .proto_handler import get_message_parser, UpstoxV3MessageParser
@@ -87,6 +90,15 @@ class UpstoxWebSocketClient:
         # DNS resolution tracking
         self.dns_failure_count = 0
         self.last_dns_failure_time = 0
+        
+        # Size of the most recent inbound frame (diagnostics only - the
+        # frame itself is not retained)
+        self.last_frame_size: Optional[int] = None
+        
+        # Outbound requests go through one writer task (see _writer_loop);
+        # each queue item is (frames, future resolved with the send result)
+        self._out_q: asyncio.Queue = asyncio.Queue(maxsize=WEBSOCKET_SEND_QUEUE_SIZE)
+        self._writer_task: Optional[asyncio.Task] = None
 
     async def _resolve_with_fallback(self, hostname: str) -> Optional[str]:
         """
@@ -284,6 +296,7 @@ class UpstoxWebSocketClient:
         # Success
         self.is_connected = True
         self.reconnect_attempts = 0
+        self._start_writer()
         logger.info("=" * 80)
         logger.info("[SUCCESS] WebSocket fully connected and authenticated!")
         logger.info("=" * 80)
@@ -292,6 +305,12 @@ class UpstoxWebSocketClient:
 
     async def disconnect(self):
         """Disconnect from WebSocket"""
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+        # Frames queued for this connection must not go out on the next one
+        self._drain_send_queue()
+
         if self.websocket:
             try:
                 await self.websocket.close()
@@ -300,6 +319,106 @@ class UpstoxWebSocketClient:
             except Exception as e:
                 logger.error(f"Error disconnecting: {e}")
 
+    def _build_frames(self, method: str, symbols: List[str], mode: Optional[str] = None) -> List[bytes]:
+        """
+        Build sub/unsub frames, packing up to WEBSOCKET_MAX_KEYS_PER_FRAME
+        instrument keys into each frame.
+        
+        Args:
+            method: "sub" or "unsub"
+            symbols: List of symbols to include
+            mode: Subscription mode (only sent for "sub")
+        
+        Returns:
+            List of encoded frames ready to send
+        """
+        # Convert symbols to Upstox V3 format if needed
+        instrument_keys = [self._symbol_to_token(symbol) for symbol in symbols]
+        logger.debug(f"[VERBOSE] Instrument Keys: {instrument_keys}")
+        
+        # Fields shared by every frame of this call are built once
+        data_template = {"mode": mode} if mode is not None else {}
+        
+        frames = []
+        for start in range(0, len(instrument_keys), WEBSOCKET_MAX_KEYS_PER_FRAME):
+            request = {
+                "guid": f"{method}-{secrets.token_hex(8)}",
+                "method": method,
+                "data": {
+                    **data_template,
+                    "instrumentKeys": instrument_keys[start:start + WEBSOCKET_MAX_KEYS_PER_FRAME]
+                }
+            }
+            # CRITICAL FIX: V3 requires messages as BINARY, not text
+            # dumps() already returns UTF-8 bytes
+            frames.append(dumps(request))
+        return frames
+
+    def _start_writer(self) -> None:
+        """Start the outbound writer task if it is not already running"""
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def _writer_loop(self) -> None:
+        """
+        Single consumer for the outbound queue.
+        
+        Wakes once per burst and drains up to WEBSOCKET_SEND_BATCH_SIZE
+        queued requests, so senders never create a task per message.
+        Frames are still sent individually - V3 expects one JSON request
+        per WebSocket message. Each request's future is resolved with
+        True once all its frames are sent, or False if a send fails.
+        """
+        while True:
+            batch = [await self._out_q.get()]
+            while len(batch) < WEBSOCKET_SEND_BATCH_SIZE:
+                try:
+                    batch.append(self._out_q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                for frames, done in batch:
+                    if done.done():  # Caller went away (cancelled)
+                        continue
+                    try:
+                        for frame in frames:
+                            await self.websocket.send(frame)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        logger.error(f"[ERROR] Failed to send {len(frames)} queued frame(s): {type(e).__name__} - {e}")
+                        done.set_result(False)
+                    else:
+                        done.set_result(True)
+            except asyncio.CancelledError:
+                for _, done in batch:
+                    if not done.done():
+                        done.set_result(False)
+                raise
+
+    def _drain_send_queue(self) -> None:
+        """Drop every queued request, failing its waiter"""
+        while True:
+            try:
+                _, done = self._out_q.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if not done.done():
+                done.set_result(False)
+
+    async def _send_frames(self, frames: List[bytes]) -> bool:
+        """
+        Queue frames for the writer task (waits if the queue is full)
+        
+        Returns:
+            bool: True once every frame was sent, False if sending failed
+        """
+        self._start_writer()
+        done = asyncio.get_running_loop().create_future()
+        await self._out_q.put((frames, done))
+        return await done
+
     async def subscribe(self, symbols: List[str], mode: str = "full") -> bool:
         """
         Subscribe to symbols using Upstox V3 protocol
@@ -313,6 +432,10 @@ class UpstoxWebSocketClient:
             }
         }
         
+        All symbols are packed into as few frames as possible (up to
+        WEBSOCKET_MAX_KEYS_PER_FRAME keys each) - one frame per call for
+        typical batch sizes, never one frame per symbol.
+        
         Args:
             symbols: List of symbols (e.g., ["NSE_INDEX|Nifty 50"])
             mode: Subscription mode - "full", "ltpc", or "option_greeks"
@@ -325,29 +448,16 @@ class UpstoxWebSocketClient:
             return False
 
         try:
-            # Convert symbols to Upstox V3 format if needed
-            instrument_keys = [self._symbol_to_token(symbol) for symbol in symbols]
-            
-            subscription_request = {
-                "guid": f"sub-{'-'.join(symbols[:2])}-{len(symbols)}",
-                "method": "sub",
-                "data": {
-                    "mode": mode,
-                    "instrumentKeys": instrument_keys
-                }
-            }
-            
             logger.info(f"[VERBOSE] Subscribing to {len(symbols)} symbols in '{mode}' mode")
             logger.debug(f"[VERBOSE] Symbols: {symbols}")
-            logger.debug(f"[VERBOSE] Instrument Keys: {instrument_keys}")
             
-            # CRITICAL FIX: V3 requires subscription messages as BINARY, not text
-            # Convert JSON to bytes before sending
-            message_bytes = json.dumps(subscription_request).encode('utf-8')
-            await self.websocket.send(message_bytes)
+            frames = self._build_frames("sub", symbols, mode)
+            if not await self._send_frames(frames):
+                logger.error(f"[ERROR] Subscription request for {len(symbols)} symbols was not sent")
+                return False
             
             self.subscribed_symbols.update(symbols)
-            logger.info(f"[SUCCESS] Subscription request sent for {len(symbols)} symbols (binary)")
+            logger.info(f"[SUCCESS] Subscription request sent for {len(symbols)} symbols in {len(frames)} frame(s) (binary)")
             
             return True
             
@@ -379,25 +489,14 @@ class UpstoxWebSocketClient:
             return False
 
         try:
-            # Convert symbols to Upstox V3 format if needed
-            instrument_keys = [self._symbol_to_token(symbol) for symbol in symbols]
-            
-            unsubscription_request = {
-                "guid": f"unsub-{'-'.join(symbols[:2])}-{len(symbols)}",
-                "method": "unsub",
-                "data": {
-                    "instrumentKeys": instrument_keys
-                }
-            }
-            
             logger.info(f"[VERBOSE] Unsubscribing from {len(symbols)} symbols")
             
-            # CRITICAL FIX: V3 requires messages as BINARY, not text
-            message_bytes = json.dumps(unsubscription_request).encode('utf-8')
-            await self.websocket.send(message_bytes)
+            frames = self._build_frames("unsub", symbols)
+            if not await self._send_frames(frames):
+                logger.error(f"[ERROR] Unsubscription request for {len(symbols)} symbols was not sent")
+                return False
             
-            for symbol in symbols:
-                self.subscribed_symbols.discard(symbol)
+            self.subscribed_symbols.difference_update(symbols)
             
             logger.info(f"[SUCCESS] Unsubscription request sent for {len(symbols)} symbols (binary)")
             return True
@@ -453,7 +552,7 @@ class UpstoxWebSocketClient:
             await self.telegram.send_message(f"🚨 <b>CRITICAL: WebSocket Fatal Error!</b>\nError: <code>{str(e)}</code>")
             self.is_connected = False
 
-    async def _handle_message(self, message: bytes) -> None:
+    async def _handle_message(self, message: Union[bytes, bytearray, memoryview]) -> None:
         """
         Handle incoming WebSocket message from Upstox V3
         Uses UpstoxV3MessageParser for proper V3 message handling.
@@ -464,18 +563,22 @@ class UpstoxWebSocketClient:
         - control: Subscription/unsubscription responses
         
         Args:
-            message: Raw message bytes from WebSocket
+            message: Raw message from WebSocket. Any bytes-like object is
+                parsed in place, without copying.
         """
         try:
             # Log message received
-            if isinstance(message, bytes):
-                logger.info(f"[WEBSOCKET] Message received: {len(message)} bytes")
+            if isinstance(message, (bytes, bytearray, memoryview)):
+                frame_size = self.last_frame_size = len(message)
+                logger.info(f"[WEBSOCKET] Message received: {frame_size} bytes")
+            else:
+                frame_size = 'unknown'
             
             # Use V3 message parser
             parsed = self.message_parser.parse_message(message)
             
             if not parsed:
-                logger.debug(f"[VERBOSE] Could not parse message ({len(message) if isinstance(message, bytes) else 'unknown'} bytes)")
+                logger.debug(f"[VERBOSE] Could not parse message ({frame_size} bytes)")
                 return
             
             msg_type = parsed.get("type")
@@ -508,6 +611,8 @@ class UpstoxWebSocketClient:
                 
                 logger.debug(f"[FEED] Received {len(ticks)} ticks")
                 
+                handlers = self.message_handlers
+                
                 for tick_data in ticks:
                     # Convert to TickData model
                     tick = self._parse_v3_tick(tick_data)
@@ -516,11 +621,24 @@ class UpstoxWebSocketClient:
                         # Cache the price for fallback position monitoring
                         self._cache_price(tick.symbol, tick.last_price, tick.timestamp)
                         
-                        for handler in self.message_handlers:
+                        if not handlers:
+                            continue
+                        
+                        # Common case: one handler - await it directly, no gather/Task overhead
+                        if len(handlers) == 1:
                             try:
-                                await handler(tick)
+                                await handlers[0](tick)
                             except Exception as e:
                                 logger.error(f"[ERROR] Error in message handler: {e}")
+                            continue
+                        
+                        results = await asyncio.gather(
+                            *(handler(tick) for handler in handlers),
+                            return_exceptions=True
+                        )
+                        for result in results:
+                            if isinstance(result, Exception):
+                                logger.error(f"[ERROR] Error in message handler: {result}")
             else:
                 logger.debug(f"[VERBOSE] Unknown message type: {msg_type}")
 
@@ -555,7 +673,9 @@ class UpstoxWebSocketClient:
         try:
             instrument_key = data.get("instrument_key", "")
             
-            tick = TickData(
+            # Every field is coerced explicitly below, so skip pydantic
+            # validation - this runs once per tick on the hot path
+            tick = TickData.model_construct(
                 symbol=instrument_key,  # V3 uses instrument_key as identifier
                 token=instrument_key,
                 last_price=float(data.get("ltp", 0)),
@@ -574,7 +694,7 @@ class UpstoxWebSocketClient:
                 gamma=float(data.get("gamma", 0)),
                 theta=float(data.get("theta", 0)),
                 vega=float(data.get("vega", 0)),
-                timestamp=ist_now()
+                timestamp=time.time()
             )
             return tick
             
@@ -587,12 +707,15 @@ class UpstoxWebSocketClient:
         Parse incoming data into TickData model (legacy method)
         
         Args:
-            data: Raw data from WebSocket
+            data: Raw data from WebSocket (dict, or undecoded JSON bytes)
         
         Returns:
             TickData or None if parsing fails
         """
         try:
+            if isinstance(data, (bytes, bytearray)):
+                data = loads(data)
+
             tick = TickData(
                 symbol=data.get("symbol", ""),
                 token=data.get("tk"),
@@ -612,7 +735,7 @@ class UpstoxWebSocketClient:
                 gamma=float(data.get("gamma", 0)),
                 theta=float(data.get("theta", 0)),
                 vega=float(data.get("vega", 0)),
-                timestamp=ist_now()
+                timestamp=time.time()
             )
             return tick
             
@@ -624,27 +747,32 @@ class UpstoxWebSocketClient:
         """
         Register a message handler callback
         
+        Pass the coroutine function itself, not a lambda or other wrapper -
+        it is awaited once per tick, so every extra call layer is paid on
+        the hot path. With several handlers registered they run
+        concurrently for each tick.
+        
         Args:
             handler: Async function to call on each message
         """
         self.message_handlers.append(handler)
         logger.info(f"Registered message handler: {handler.__name__}")
     
-    def _cache_price(self, symbol: str, price: float, timestamp: datetime) -> None:
+    def _cache_price(self, symbol: str, price: float, timestamp: float) -> None:
         """
         Cache price for fallback position monitoring when WebSocket is down.
         
         Args:
             symbol: Symbol/instrument key
             price: Current price
-            timestamp: Time of price update
+            timestamp: Time of price update (Unix epoch seconds)
         """
         self.price_cache[symbol] = {
             "price": price,
             "timestamp": timestamp,
-            "time_unix": time.time()
+            "time_unix": timestamp
         }
-        self.last_cache_update_time = time.time()
+        self.last_cache_update_time = timestamp
     
     def get_cached_price(self, symbol: str) -> Optional[float]:
         """
@@ -725,6 +853,9 @@ class UpstoxWebSocketClient:
             return
         
         logger.info(f"[VERBOSE] Attempting reconnection...")
+        # Requests queued for the dead socket are dropped; subscriptions are
+        # replayed from subscribed_symbols below
+        self._drain_send_queue()
         if await self.connect():
             logger.info("[SUCCESS] Reconnection successful!")
             if self.subscribed_symbols:
@@ -734,11 +865,15 @@ class UpstoxWebSocketClient:
             logger.warning("[WARNING] Reconnection attempt failed, will retry")
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _symbol_to_token(symbol: str) -> str:
         """
         Convert symbol to token for Upstox V3 API
         Upstox V3 expects format: NSE_EQ|INFY or NSE_FO|INFY23D15800CE
         
+        Results are memoized - the subscribed universe is a few hundred
+        keys, so repeat calls (resubscribe, reconnect) reuse the same string.
+        
         Args:
             symbol: Symbol name (can be with or without prefix)
         
@@ -5,7 +5,7 @@ Data models for Upstox V3 WebSocket messages
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
-from ..config.timezone import ist_now
+from ..config.timezone import IST_TZ, ist_now
 
 
 class TickData(BaseModel):
@@ -39,8 +39,13 @@ class TickData(BaseModel):
     theta: float = 0.0
     vega: float = 0.0
     
-    # Timestamp
-    timestamp: datetime
+    # Timestamp - Unix epoch seconds (cheap to produce per tick)
+    timestamp: float
+    
+    @property
+    def timestamp_dt(self) -> datetime:
+        """Timestamp as a timezone-aware IST datetime"""
+        return datetime.fromtimestamp(self.timestamp, tz=IST_TZ)
     
     class Config:
         json_schema_extra = {
@@ -60,7 +65,7 @@ class TickData(BaseModel):
                 "ask_volume": 1500,
                 "iv": 25.5,
                 "delta": 0.75,
-                "timestamp": "2025-11-29T10:30:00Z"
+                "timestamp": 1764412200.0
             }
         }
 
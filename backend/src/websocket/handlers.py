@@ -10,17 +10,18 @@ Updated for Upstox V3:
 """
 
 import asyncio
-import json
 import os
 import logging
 from datetime import datetime
 from typing import Optional, Dict
 from logging.handlers import RotatingFileHandler
+import numpy as np
 from sqlalchemy.orm import Session
 
 from ..config.logging import websocket_logger as logger
-from ..config.timezone import IST_TZ, ist_now
+from ..config.timezone import IST_TZ, ist_now, ist_clock
 from ..config.settings import settings
+from ..config.json_utils import dumps
 from ..data.models import Tick, Symbol, SubscribedOption
 from ..data.database import SessionLocal
 from .data_models import TickData
@@ -103,11 +104,11 @@ def _should_sample() -> bool:
     return True
 
 
-def _write_json_log(tick_data: TickData, option_name: str):
+def _write_json_log(tick_data: TickData, option_name: str, ts: str):
     """Write a single tick as JSONL (daily file with rotation)."""
     try:
         tick_json = {
-            "ts": ist_now().strftime('%H:%M:%S'),  # Shorter timestamp in IST
+            "ts": ts,  # Shorter timestamp in IST
             "opt": option_name[:30],  # Truncate option name
             "key": tick_data.symbol,
             "ltp": round(tick_data.last_price, 2),
@@ -120,8 +121,9 @@ def _write_json_log(tick_data: TickData, option_name: str):
         if os.path.exists(json_log_path) and os.path.getsize(json_log_path) > MAX_LOG_SIZE:
             _rotate_file(json_log_path)
 
-        with open(json_log_path, 'a') as f:
-            f.write(json.dumps(tick_json, separators=(',', ':')) + '\n')
+        # dumps() returns compact UTF-8 bytes (orjson when installed)
+        with open(json_log_path, 'ab') as f:
+            f.write(dumps(tick_json) + b'\n')
     except Exception as e:
         logger.error(f"Error writing JSON log: {e}")
 
@@ -136,7 +138,7 @@ def _ensure_toon_header(toon_path: str):
         logger.error(f"Error preparing TOON log header: {e}")
 
 
-def _write_toon_log(tick_data: TickData, option_name: str):
+def _write_toon_log(tick_data: TickData, option_name: str, ts: str):
     """Write a single tick row in TOON tabular form (daily file + rotation)."""
     try:
         toon_log_path = _dated_log_path('toon')
@@ -145,7 +147,6 @@ def _write_toon_log(tick_data: TickData, option_name: str):
 
         _ensure_toon_header(toon_log_path)
 
-        ts = ist_now().strftime('%H:%M:%S')
         opt = option_name[:50]  # keep readable but bounded
         key = tick_data.symbol
         ltp = f"{tick_data.last_price:.2f}" if tick_data.last_price is not None else "null"
@@ -171,16 +172,24 @@ def log_tick_structured(tick_data: TickData, option_name: str):
     if not _should_sample():
         return
 
+    # Format the tick time once (from its epoch timestamp) for both writers
+    ts = ist_clock(tick_data.timestamp)
+
     if ENABLE_FILE_LOGGING:
-        _write_json_log(tick_data, option_name)
+        _write_json_log(tick_data, option_name, ts)
 
     if ENABLE_TOON_LOGGING:
-        _write_toon_log(tick_data, option_name)
+        _write_toon_log(tick_data, option_name, ts)
 
 
 class TickDataHandler:
     """Handles incoming tick data from WebSocket"""
 
+    __slots__ = (
+        "db", "tick_count", "last_log_time",
+        "_instrument_key_cache", "_instrument_key_to_name", "_cache_loaded"
+    )
+
     def __init__(self, db_session: Optional[Session] = None):
         """
         Initialize tick handler
@@ -217,9 +226,8 @@ class TickDataHandler:
                     self._instrument_key_to_name[opt.instrument_key] = opt.option_symbol or opt.symbol
             
             # 2. Add Underlyings from ISIN_MAPPING
-            from ..data.isin_mapping_hardcoded import ISIN_MAPPING
-            for name, isin in ISIN_MAPPING.items():
-                inst_key = f"NSE_EQ|{isin}"
+            from ..data.isin_mapping_hardcoded import INSTRUMENT_KEY_MAPPING
+            for name, inst_key in INSTRUMENT_KEY_MAPPING.items():
                 symbol = self.db.query(Symbol).filter(Symbol.symbol == name).first()
                 if symbol:
                     self._instrument_key_cache[inst_key] = symbol.id
@@ -293,7 +301,7 @@ class TickDataHandler:
                         ask=tick_data.ask,
                         bid_volume=tick_data.bid_volume,
                         ask_volume=tick_data.ask_volume,
-                        timestamp=tick_data.timestamp
+                        timestamp=tick_data.timestamp_dt
                     )
 
                     # Add to session
@@ -344,13 +352,46 @@ class TickDataHandler:
 
 
 class AggregatedTickHandler:
-    """Aggregates ticks and provides statistics"""
+    """
+    Aggregates ticks and provides statistics
+    
+    Latest values are stored column-wise: one NumPy array per field,
+    indexed through a symbol -> row map, instead of a dict per symbol.
+    """
+
+    INITIAL_CAPACITY = 256
+
+    __slots__ = ("_idx", "_price", "_vol", "_bid", "_ask", "_ts", "price_updates")
 
     def __init__(self):
         """Initialize aggregated tick handler"""
-        self.ticks_by_symbol = {}
+        self._idx: Dict[str, int] = {}
+        self._price = np.zeros(self.INITIAL_CAPACITY)
+        self._vol = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)
+        self._bid = np.zeros(self.INITIAL_CAPACITY)
+        self._ask = np.zeros(self.INITIAL_CAPACITY)
+        self._ts = np.zeros(self.INITIAL_CAPACITY)
         self.price_updates = 0
 
+    def _grow(self) -> None:
+        """Double the capacity of every column, keeping existing rows"""
+        capacity = len(self._price) * 2
+        for name in ("_price", "_vol", "_bid", "_ask", "_ts"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _row(self, symbol: str) -> int:
+        """Get the row index for a symbol, allocating one if needed"""
+        row = self._idx.get(symbol)
+        if row is None:
+            row = len(self._idx)
+            if row == len(self._price):
+                self._grow()
+            self._idx[symbol] = row
+        return row
+
     async def handle_tick(self, tick_data: TickData) -> bool:
         """
         Handle tick with aggregation
@@ -362,17 +403,13 @@ class AggregatedTickHandler:
             bool: True if handled successfully
         """
         try:
-            # Update in-memory cache
-            if tick_data.symbol not in self.ticks_by_symbol:
-                self.ticks_by_symbol[tick_data.symbol] = {}
-
-            self.ticks_by_symbol[tick_data.symbol] = {
-                "price": tick_data.last_price,
-                "volume": tick_data.volume,
-                "bid": tick_data.bid,
-                "ask": tick_data.ask,
-                "timestamp": tick_data.timestamp
-            }
+            # Update in-memory columns
+            row = self._row(tick_data.symbol)
+            self._price[row] = tick_data.last_price
+            self._vol[row] = tick_data.volume
+            self._bid[row] = tick_data.bid
+            self._ask[row] = tick_data.ask
+            self._ts[row] = tick_data.timestamp
 
             self.price_updates += 1
             return True
@@ -383,13 +420,30 @@ class AggregatedTickHandler:
 
     def get_latest_tick(self, symbol: str) -> Optional[dict]:
         """Get latest tick for a symbol"""
-        return self.ticks_by_symbol.get(symbol)
+        row = self._idx.get(symbol)
+        if row is None:
+            return None
+
+        return {
+            "price": float(self._price[row]),
+            "volume": int(self._vol[row]),
+            "bid": float(self._bid[row]),
+            "ask": float(self._ask[row]),
+            "timestamp": float(self._ts[row])
+        }
 
     def get_stats(self) -> dict:
-        """Get aggregation statistics"""
+        """Get aggregation statistics (NumPy reductions over the filled rows)"""
+        n = len(self._idx)
+        prices = self._price[:n]
+        volumes = self._vol[:n]
+
         return {
-            "symbols_tracked": len(self.ticks_by_symbol),
-            "price_updates": self.price_updates
+            "symbols_tracked": n,
+            "price_updates": self.price_updates,
+            "price_p50": float(np.median(prices)) if n else 0.0,
+            "vol_total": int(volumes.sum()),
+            "vol_max": int(volumes.max()) if n else 0
         }
 
 
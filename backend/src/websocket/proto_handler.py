@@ -5,10 +5,10 @@ Handles encoding/decoding of binary protobuf messages
 Uses compiled MarketDataFeed_pb2.py for proper protobuf parsing.
 """
 
-import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 
 from ..config.timezone import ist_timestamp
+from ..config.json_utils import dumps, loads
 
 from ..config.logging import websocket_logger as logger
 
@@ -111,7 +111,7 @@ class UpstoxV3MessageParser:
         }
         
         # V3 accepts JSON text for subscriptions
-        return json.dumps(request).encode('utf-8')
+        return dumps(request)
     
     def create_unsubscription_request(
         self,
@@ -139,9 +139,9 @@ class UpstoxV3MessageParser:
             }
         }
         
-        return json.dumps(request).encode('utf-8')
+        return dumps(request)
     
-    def parse_message(self, message: bytes) -> Optional[Dict[str, Any]]:
+    def parse_message(self, message: Union[bytes, bytearray, memoryview]) -> Optional[Dict[str, Any]]:
         """
         Parse incoming WebSocket message
         
@@ -150,28 +150,22 @@ class UpstoxV3MessageParser:
         2. Binary protobuf for market data (live_feed, market_info)
         
         Args:
-            message: Raw message bytes from WebSocket
+            message: Raw message bytes from WebSocket (bytes, bytearray or
+                memoryview - both JSON and protobuf parse it without a copy)
         
         Returns:
             Parsed message dict or None if parsing fails
         """
         try:
-            # Try to decode as JSON first (control messages)
-            if isinstance(message, bytes):
-                try:
-                    text = message.decode('utf-8')
-                    data = json.loads(text)
-                    return self._parse_control_message(data)
-                except (UnicodeDecodeError, json.JSONDecodeError):
-                    # Not JSON - try binary protobuf
-                    pass
-            else:
-                # String message (shouldn't happen for V3)
-                try:
-                    data = json.loads(message)
-                    return self._parse_control_message(data)
-                except json.JSONDecodeError:
-                    pass
+            # Try to decode as JSON first (control messages).
+            # loads() takes bytes directly - no intermediate str decode.
+            # Invalid UTF-8 and invalid JSON both raise ValueError subclasses.
+            try:
+                data = loads(message)
+                return self._parse_control_message(data)
+            except ValueError:
+                # Not JSON - try binary protobuf
+                pass
             
             # Parse as binary protobuf
             return self._parse_protobuf(message)
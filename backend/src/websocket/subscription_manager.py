@@ -36,13 +36,9 @@ class SubscriptionManager:
         Using ISIN mapping for proper Upstox V3 identifier format: NSE_EQ|{ISIN}
         """
         try:
-            from ..data.isin_mapping_hardcoded import ISIN_MAPPING
+            from ..data.isin_mapping_hardcoded import INSTRUMENT_KEY_MAPPING
             
-            instrument_keys = []
-            for symbol, isin in ISIN_MAPPING.items():
-                instrument_keys.append(f"NSE_EQ|{isin}")
-            
-            self.all_symbols = set(instrument_keys)
+            self.all_symbols = set(INSTRUMENT_KEY_MAPPING.values())
             logger.info(f"✅ Loaded {len(self.all_symbols)} FNO underlyings for data collection")
             return self.all_symbols
             
@@ -61,10 +57,16 @@ class SubscriptionManager:
             logger.error("Option universe is empty. Load it first.")
             return False
 
-        logger.info(f"🔄 Subscribing to {len(self.all_symbols)} option contracts (ATM ± 1)...")
-        
+        # Only send keys that are not already subscribed (e.g. after a partial resubscribe)
+        pending = self.all_symbols - self.subscribed_symbols
+        if not pending:
+            logger.info(f"✅ All {len(self.all_symbols)} option contracts already subscribed")
+            return True
+
+        logger.info(f"🔄 Subscribing to {len(pending)} option contracts (ATM ± 1)...")
+
         # Subscribe in batches to avoid overwhelming the API
-        symbols_list = list(self.all_symbols)
+        symbols_list = list(pending)
         total_batches = (len(symbols_list) + self.subscription_batch_size - 1) // self.subscription_batch_size
         
         for batch_num in range(total_batches):
@@ -79,6 +81,8 @@ class SubscriptionManager:
             
             if success:
                 self.subscribed_symbols.update(batch)
+                # A batch that failed on an earlier pass is no longer failed
+                self.failed_subscriptions.difference_update(batch)
             else:
                 self.failed_subscriptions.update(batch)
                 logger.warning(f"Failed to subscribe to batch {batch_num + 1}")
@@ -127,8 +131,7 @@ class SubscriptionManager:
         success = await self.ws_client.unsubscribe(symbols)
         
         if success:
-            for symbol in symbols:
-                self.subscribed_symbols.discard(symbol)
+            self.subscribed_symbols.difference_update(symbols)
             return True
         else:
             return False
@@ -163,6 +166,7 @@ class SubscriptionManager:
         return {
             "total_symbols": len(self.all_symbols),
             "subscribed": len(self.subscribed_symbols),
+            "pending": len(self.all_symbols - self.subscribed_symbols),
             "failed": len(self.failed_subscriptions),
             "subscription_rate": f"{(len(self.subscribed_symbols) / max(len(self.all_symbols), 1)) * 100:.1f}%"
         }
@@ -12,49 +12,89 @@ This script:
 5. Validates all mappings work with Upstox API
 """
 
-import gzip
+import asyncio
+import functools
+import hashlib
 import json
-import requests
+import os
+import tempfile
+import zlib
+import httpx
 import sys
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 from datetime import datetime
-import subprocess
-import time
-
-# The 208 official NSE FNO symbols
-FNO_SYMBOLS_LIST = [
-    "360ONE", "ABB", "APLAPOLLO", "AUBANK", "ADANIENSOL", "ADANIENT", "ADANIGREEN",
-    "ADANIPORTS", "ABCAPITAL", "ALKEM", "AMBER", "AMBUJACEM", "ANGELONE", "APOLLOHOSP",
-    "ASHOKLEY", "ASIANPAINT", "ASTRAL", "AUROPHARMA", "DMART", "AXISBANK", "BSE",
-    "BAJAJ-AUTO", "BAJFINANCE", "BAJAJFINSV", "BANDHANBNK", "BANKBARODA", "BANKINDIA",
-    "BDL", "BEL", "BHARATFORG", "BHEL", "BPCL", "BHARTIARTL", "BIOCON", "BLUESTARCO",
-    "BOSCHLTD", "BRITANNIA", "CGPOWER", "CANBK", "CDSL", "CHOLAFIN", "CIPLA",
-    "COALINDIA", "COFORGE", "COLPAL", "CAMS", "CONCOR", "CROMPTON", "CUMMINSIND",
-    "CYIENT", "DLF", "DABUR", "DALBHARAT", "DELHIVERY", "DIVISLAB", "DIXON",
-    "DRREDDY", "ETERNAL", "EICHERMOT", "EXIDEIND", "NYKAA", "FORTIS", "GAIL",
-    "GMRAIRPORT", "GLENMARK", "GODREJCP", "GODREJPROP", "GRASIM", "HCLTECH",
-    "HDFCAMC", "HDFCBANK", "HDFCLIFE", "HFCL", "HAVELLS", "HEROMOTOCO", "HINDALCO",
-    "HAL", "HINDPETRO", "HINDUNILVR", "HINDZINC", "POWERINDIA", "HUDCO", "ICICIBANK",
-    "ICICIGI", "ICICIPRULI", "IDFCFIRSTB", "IIFL", "ITC", "INDIANB", "IEX",
-    "IOC", "IRCTC", "IRFC", "IREDA", "INDUSTOWER", "INDUSINDBK", "NAUKRI",
-    "INFY", "INOXWIND", "INDIGO", "JINDALSTEL", "JSWENERGY", "JSWSTEEL", "JIOFIN",
-    "JUBLFOOD", "KEI", "KPITTECH", "KALYANKJIL", "KAYNES", "KFINTECH", "KOTAKBANK",
-    "LTF", "LICHSGFIN", "LTIM", "LT", "LAURUSLABS", "LICI", "LODHA",
-    "LUPIN", "M&M", "MANAPPURAM", "MANKIND", "MARICO", "MARUTI", "MFSL",
-    "MAXHEALTH", "MAZDOCK", "MPHASIS", "MCX", "MUTHOOTFIN", "NBCC", "NCC",
-    "NHPC", "NMDC", "NTPC", "NATIONALUM", "NESTLEIND", "NUVAMA", "OBEROIRLTY",
-    "ONGC", "OIL", "PAYTM", "OFSS", "POLICYBZR", "PGEL", "PIIND",
-    "PNBHOUSING", "PAGEIND", "PATANJALI", "PERSISTENT", "PETRONET", "PIDILITIND",
-    "PPLPHARMA", "POLYCAB", "PFC", "POWERGRID", "PRESTIGE", "PNB", "RBLBANK",
-    "RECLTD", "RVNL", "RELIANCE", "SBICARD", "SBILIFE", "SHREECEM", "SRF",
-    "SAMMAANCAP", "MOTHERSON", "SHRIRAMFIN", "SIEMENS", "SOLARINDS", "SONACOMS",
-    "SBIN", "SAIL", "SUNPHARMA", "SUPREMEIND", "SUZLON", "SYNGENE", "TATACONSUM",
-    "TITAGARH", "TVSMOTOR", "TCS", "TATAELXSI", "TMPV", "TATAPOWER", "TATASTEEL",
-    "TATATECH", "TECHM", "FEDERALBNK", "INDHOTEL", "PHOENIXLTD", "TITAN", "TORNTPHARM",
-    "TORNTPOWER", "TRENT", "TIINDIA", "UNOMINDA", "UPL", "ULTRACEMCO", "UNIONBANK",
-    "UNITDSPR", "VBL", "VEDL", "IDEA", "VOLTAS", "WIPRO", "YESBANK", "ZYDUSLIFE"
-]
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    import h2  # noqa: F401 - httpx only needs it importable for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+PROGRESS_REPORT_BYTES = 512 * 1024  # Print download progress every 512KB
+LTP_BATCH_SIZE = 50  # Instrument keys per LTP request
+
+# Per-symbol result lines are buffered and written in one batch at the end of
+# each phase (flush_progress) instead of one stdout write per line
+_progress_lines: List[str] = []
+
+
+def progress(line: str) -> None:
+    """Buffer one progress line until the next flush_progress()"""
+    _progress_lines.append(line)
+
+
+def flush_progress() -> None:
+    """Write out buffered progress lines (call before the next print)"""
+    if _progress_lines:
+        sys.stdout.write('\n'.join(_progress_lines) + '\n')
+        _progress_lines.clear()
+
+
+# Decompressed instruments dump, reused while the server's ETag is unchanged
+INSTRUMENTS_CACHE_DIR = Path.home() / ".cache" / "kakarot"
+INSTRUMENTS_CACHE_META = INSTRUMENTS_CACHE_DIR / "upstox_instruments.meta.json"
+
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+# The 208 official NSE FNO symbols, one per line in fno_symbols.txt (interned
+# so dict probes against the interned instrument symbols compare by identity)
+FNO_SYMBOLS_FILE = Path(__file__).with_name("fno_symbols.txt")
+FNO_SYMBOLS_LIST = [sys.intern(symbol) for symbol in FNO_SYMBOLS_FILE.read_text().split()]
+FNO_SYMBOLS_SET = frozenset(FNO_SYMBOLS_LIST)
+
+try:
+    from dotenv import dotenv_values
+    DOTENV_AVAILABLE = True
+except ImportError:
+    DOTENV_AVAILABLE = False
+
+ENV_FILE = "backend/.env"
+
+
+@functools.lru_cache(maxsize=1)
+def get_token(env_file: str = ENV_FILE) -> Optional[str]:
+    """Read UPSTOX_ACCESS_TOKEN from the backend .env file (parsed once per run)"""
+    if DOTENV_AVAILABLE:
+        return dotenv_values(env_file).get("UPSTOX_ACCESS_TOKEN")
+    with open(env_file) as f:
+        for line in f:
+            key, sep, value = line.partition("=")
+            if sep and key.strip() == "UPSTOX_ACCESS_TOKEN":
+                # partition keeps any '=' inside the value intact
+                return value.strip().strip('"\'')
+    return None
 
 
 class ISINResolver:
@@ -64,6 +104,8 @@ class ISINResolver:
         self.isin_mapping: Dict[str, str] = {}
         self.failed_symbols: List[Tuple[str, str]] = []
         self.instruments_data: List[Dict] = []
+        # Reused simdjson parser; its documents stay valid until the next parse()
+        self._json_parser = simdjson.Parser() if SIMDJSON_AVAILABLE else None
         
     def download_instruments(self) -> bool:
         """
@@ -83,43 +125,87 @@ class ISINResolver:
         print()
         print("⏳ Downloading... (this may take 30-60 seconds)")
         
+        # Conditional request: if the dump is unchanged since the last run the
+        # server answers 304 and the cached decompressed copy is parsed instead
+        cache_meta = self._load_instruments_cache_meta()
+        request_headers = {}
+        if cache_meta:
+            if cache_meta.get("etag"):
+                request_headers["If-None-Match"] = cache_meta["etag"]
+            if cache_meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = cache_meta["last_modified"]
+        
         try:
-            response = requests.get(url, timeout=120, stream=True)
+            cache_hit = False
             
-            if response.status_code != 200:
-                print(f"❌ HTTP {response.status_code}")
-                return False
-            
-            # Download with progress
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            
-            print(f"📦 File size: {total_size / (1024*1024):.1f} MB")
-            print()
+            # Persistent client (HTTP/2 when h2 is installed); iter_raw yields the
+            # undecoded body in 1 MB chunks so the loop runs ~50x, not ~6000x
+            with httpx.Client(http2=HTTP2_AVAILABLE, timeout=120, follow_redirects=True) as client:
+                with client.stream("GET", url, headers=request_headers) as response:
+                    if response.status_code == 304 and cache_meta:
+                        cache_hit = True
+                    elif response.status_code != 200:
+                        print(f"❌ HTTP {response.status_code}")
+                        return False
+                    else:
+                        etag = response.headers.get("etag")
+                        last_modified = response.headers.get("last-modified")
+                        
+                        # Download with progress
+                        total_size = int(response.headers.get('content-length', 0))
+                        downloaded = 0
+                        
+                        print(f"📦 File size: {total_size / (1024*1024):.1f} MB")
+                        print()
+                        
+                        # Decompress on-the-fly: each chunk is inflated as it arrives and
+                        # appended to one growable buffer, so the compressed payload is
+                        # never held in full and nothing is re-copied per chunk
+                        inflater = None
+                        decompressed = bytearray()
+                        # Report whenever another 512KB has arrived; a running
+                        # threshold fires regardless of how chunk sizes line up
+                        next_report = PROGRESS_REPORT_BYTES if total_size > 0 else float('inf')
+                        for chunk in response.iter_raw(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            # gzip magic bytes on the first chunk; anything else is used as-is
+                            if downloaded == 0 and chunk[:2] == b'\x1f\x8b':
+                                inflater = zlib.decompressobj(wbits=31)
+                            downloaded += len(chunk)
+                            decompressed += inflater.decompress(chunk) if inflater else chunk
+                            
+                            if downloaded >= next_report:
+                                percent = (downloaded / total_size) * 100
+                                print(f"   ⏳ Progress: {percent:.1f}% ({downloaded/(1024*1024):.1f}/{total_size/(1024*1024):.1f} MB)")
+                                next_report = downloaded + PROGRESS_REPORT_BYTES
             
-            # Decompress on-the-fly
-            decompressed_data = b''
-            for chunk in response.iter_content(chunk_size=8192):
-                downloaded += len(chunk)
-                decompressed_data += chunk
+            if cache_hit:
+                cache_file = cache_meta["file"]
+                print(f"♻️  Instruments unchanged since last run, using cache: {cache_file}")
+                print(f"📝 Parsing JSON...")
+                if self._json_parser is not None:
+                    # load() reads the file straight into the parser
+                    self.instruments_data = self._json_parser.load(cache_file)
+                else:
+                    self.instruments_data = json_loads(Path(cache_file).read_bytes())
+            else:
+                if inflater is not None:
+                    decompressed += inflater.flush()
+                    print(f"\n🔓 Decompressed {downloaded/(1024*1024):.1f} MB → {len(decompressed)/(1024*1024):.1f} MB")
                 
-                if total_size > 0:
-                    progress = (downloaded / total_size) * 100
-                    if downloaded % (512*1024) == 0:  # Every 512KB
-                        print(f"   ⏳ Progress: {progress:.1f}% ({downloaded/(1024*1024):.1f}/{total_size/(1024*1024):.1f} MB)")
-            
-            # Decompress gzip
-            print(f"\n🔓 Decompressing...")
-            try:
-                # Try gzip decompression
-                decompressed = gzip.decompress(decompressed_data)
-            except:
-                # If not gzip, use as-is
-                decompressed = decompressed_data
-            
-            # Parse JSON
-            print(f"📝 Parsing JSON...")
-            self.instruments_data = json.loads(decompressed)
+                if etag or last_modified:
+                    try:
+                        self._save_instruments_cache(decompressed, etag, last_modified)
+                    except OSError as e:
+                        print(f"⚠️  Could not cache instruments: {e}")
+                
+                # Parse JSON
+                print(f"📝 Parsing JSON...")
+                if self._json_parser is not None:
+                    # Lazy document: each instrument is a proxy and only the
+                    # fields read in extract_nse_eq_symbols get converted
+                    self.instruments_data = self._json_parser.parse(bytes(decompressed))
+                else:
+                    self.instruments_data = json_loads(decompressed)
             
             print(f"✅ Downloaded and parsed successfully!")
             print(f"   Total instruments: {len(self.instruments_data)}")
@@ -131,10 +217,47 @@ class ISINResolver:
             print(f"❌ Error: {e}")
             return False
     
+    @staticmethod
+    def _load_instruments_cache_meta() -> Optional[Dict[str, str]]:
+        """Return cached-dump metadata if it points at an existing file"""
+        try:
+            meta = json_loads(INSTRUMENTS_CACHE_META.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if (meta.get("etag") or meta.get("last_modified")) and Path(meta.get("file", "")).is_file():
+            return meta
+        return None
+    
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        """Write data to path via a temp file + os.replace (never half-written)"""
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+    
+    def _save_instruments_cache(self, data: bytes, etag: Optional[str],
+                                last_modified: Optional[str]) -> None:
+        """Store the decompressed dump under a validator-derived name, then its metadata"""
+        INSTRUMENTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        
+        previous = self._load_instruments_cache_meta()
+        digest = hashlib.sha256((etag or last_modified).encode()).hexdigest()[:16]
+        cache_file = INSTRUMENTS_CACHE_DIR / f"upstox_instruments_{digest}.json"
+        
+        self._atomic_write(cache_file, data)
+        meta = {"etag": etag, "last_modified": last_modified, "file": str(cache_file)}
+        self._atomic_write(INSTRUMENTS_CACHE_META, json.dumps(meta).encode('utf-8'))
+        
+        # Drop the superseded dump
+        if previous and previous["file"] != str(cache_file):
+            Path(previous["file"]).unlink(missing_ok=True)
+    
     def extract_nse_eq_symbols(self) -> Dict[str, str]:
         """
         Extract NSE_EQ symbols and their ISINs from downloaded data
         
+        Only symbols in the FNO universe are kept.
+        
         Returns:
             Dict mapping symbol to ISIN
         """
@@ -146,28 +269,27 @@ class ISINResolver:
         symbol_to_isin = {}
         
         for instrument in self.instruments_data:
-            try:
-                # Check if it's an NSE_EQ instrument
-                segment = instrument.get("segment", "")
-                if segment != "NSE_EQ":
-                    continue
-                
-                # Get symbol and ISIN
-                trading_symbol = instrument.get("trading_symbol", "").strip()
-                isin = instrument.get("isin", "").strip()
-                
-                # Only take equity instruments, not debt/govt securities (filter out 'SG', 'ST', etc.)
-                instrument_type = instrument.get("instrument_type", "").strip()
-                if instrument_type not in ["", "EQ"]:  # Skip non-equity types
-                    continue
-                
-                if trading_symbol and isin and len(trading_symbol) > 0:
-                    symbol_to_isin[trading_symbol] = isin
-                    
-            except Exception as e:
+            # Segment first: most records are not NSE_EQ and are rejected
+            # after a single field read
+            if instrument.get("segment") != "NSE_EQ":
+                continue
+            
+            # Only take equity instruments, not debt/govt securities (filter out 'SG', 'ST', etc.)
+            if instrument.get("instrument_type", "") not in ("", "EQ"):
+                continue
+            
+            # Strip only on the accepted path
+            trading_symbol = (instrument.get("trading_symbol") or "").strip()
+            
+            # Keep only the FNO universe - the other NSE_EQ symbols are never looked up
+            if trading_symbol not in FNO_SYMBOLS_SET:
                 continue
+            
+            isin = (instrument.get("isin") or "").strip()
+            if isin:
+                symbol_to_isin[sys.intern(trading_symbol)] = isin
         
-        print(f"✅ Extracted {len(symbol_to_isin)} NSE_EQ equity instruments")
+        print(f"✅ Extracted {len(symbol_to_isin)} FNO symbols from NSE_EQ equity instruments")
         print()
         
         return symbol_to_isin
@@ -187,27 +309,33 @@ class ISINResolver:
         print("="*100)
         print()
         
-        found_count = 0
-        missing_count = 0
+        # Resolve in two comprehensions - no printing or branching per symbol
+        resolved = {s: nse_eq_symbols[s] for s in FNO_SYMBOLS_LIST if s in nse_eq_symbols}
+        missing = [(s, "NOT FOUND IN NSE_EQ") for s in FNO_SYMBOLS_LIST if s not in nse_eq_symbols]
         
-        for symbol in FNO_SYMBOLS_LIST:
-            if symbol in nse_eq_symbols:
-                isin = nse_eq_symbols[symbol]
-                self.isin_mapping[symbol] = isin
-                found_count += 1
-                
-                # Print first 10, then every 20th
-                if found_count <= 10 or found_count % 20 == 0 or found_count == len(FNO_SYMBOLS_LIST):
-                    print(f"✅ {found_count:3}/{len(FNO_SYMBOLS_LIST):3} {symbol:20} → {isin}")
-            else:
-                self.failed_symbols.append((symbol, "NOT FOUND IN NSE_EQ"))
-                missing_count += 1
+        self.isin_mapping.update(resolved)
+        self.failed_symbols.extend(missing)
+        
+        self._report_resolution(resolved, len(missing))
+        
+        return not missing
+    
+    def _report_resolution(self, resolved: Dict[str, str], missing_count: int) -> None:
+        """Print the outcome of resolve_fno_isins"""
+        total = len(FNO_SYMBOLS_LIST)
+        found_count = len(resolved)
+        
+        # Print first 10, then every 20th
+        for n, (symbol, isin) in enumerate(resolved.items(), 1):
+            if n <= 10 or n % 20 == 0 or n == total:
+                progress(f"✅ {n:3d}/{total:3d} {symbol:<20} → {isin}")
+        flush_progress()
         
         print()
         print(f"📊 RESULTS:")
         print(f"   ✅ Resolved: {found_count}")
         print(f"   ❌ Missing: {missing_count}")
-        print(f"   Success rate: {(found_count/len(FNO_SYMBOLS_LIST)*100):.1f}%")
+        print(f"   Success rate: {(found_count/total*100):.1f}%")
         print()
         
         if missing_count > 0:
@@ -217,8 +345,6 @@ class ISINResolver:
             if len(self.failed_symbols) > 10:
                 print(f"   ... and {len(self.failed_symbols) - 10} more")
             print()
-        
-        return missing_count == 0
     
     def generate_hardcoded_list(self, output_file: str) -> bool:
         """
@@ -239,7 +365,7 @@ class ISINResolver:
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             count = len(self.isin_mapping)
             
-            content = f'''"""
+            header = f'''"""
 ISIN Mapping for 208 NSE FNO Symbols
 Source: Official Upstox Instruments API (complete.json.gz)
 These are the COMPLETE and VERIFIED ISIN codes for all 208 symbols
@@ -251,19 +377,33 @@ Generated: {timestamp}
 Total Symbols: {count}
 """
 
+import sys
+from types import MappingProxyType
+from typing import Mapping
+
 # Complete ISIN mapping for all 208 NSE FNO symbols
 # These ISINs are required for correct LTP API calls
 ISIN_MAPPING = {{
 '''
-            # Add mappings in sorted order
-            for symbol in sorted(self.isin_mapping.keys()):
-                isin = self.isin_mapping[symbol]
-                content += f'    "{symbol}": "{isin}",\n'
+            # Mappings in sorted order, comma-separated (no trailing comma)
+            entries = ',\n'.join(
+                f'    "{symbol}": "{self.isin_mapping[symbol]}"'
+                for symbol in sorted(self.isin_mapping)
+            )
             
-            # Remove trailing comma from last entry and close dict
-            content = content.rstrip(',\n') + '\n}\n\n'
-            
-            content += '''
+            footer = '''# Intern keys and values once at import so every caller shares the same
+# string objects and dict lookups with them short-circuit on identity
+ISIN_MAPPING = {sys.intern(symbol): sys.intern(isin) for symbol, isin in ISIN_MAPPING.items()}
+
+# Read-only view handed out by get_all_isins() instead of a fresh copy
+ISIN_VIEW = MappingProxyType(ISIN_MAPPING)
+
+# Upstox instrument keys (NSE_EQ|ISIN), formatted once at import
+INSTRUMENT_KEY_MAPPING = {
+    symbol: sys.intern(f"NSE_EQ|{isin}") for symbol, isin in ISIN_MAPPING.items()
+}
+
+
 def get_isin(symbol: str) -> str:
     """Get ISIN for a symbol"""
     return ISIN_MAPPING.get(symbol, None)
@@ -274,9 +414,9 @@ def get_all_symbols() -> list:
     return list(ISIN_MAPPING.keys())
 
 
-def get_all_isins() -> dict:
-    """Get complete mapping"""
-    return ISIN_MAPPING.copy()
+def get_all_isins() -> Mapping[str, str]:
+    """Get complete mapping (read-only view, no copy)"""
+    return ISIN_VIEW
 
 
 def validate_symbol(symbol: str) -> bool:
@@ -286,10 +426,7 @@ def validate_symbol(symbol: str) -> bool:
 
 def get_instrument_key(symbol: str) -> str:
     """Get full instrument key for Upstox API (NSE_EQ|ISIN format)"""
-    isin = ISIN_MAPPING.get(symbol)
-    if isin:
-        return f"NSE_EQ|{isin}"
-    return None
+    return INSTRUMENT_KEY_MAPPING.get(symbol)
 
 
 # Statistics
@@ -308,8 +445,11 @@ if __name__ == "__main__":
     print(f"Total: {{TOTAL_SYMBOLS}} symbols")
 '''
             
+            # Assemble in one join instead of growing a string piece by piece
+            content = ''.join([header, entries, '\n}\n\n', footer]).encode('utf-8')
+            
             # Write to file
-            Path(output_file).write_text(content)
+            Path(output_file).write_bytes(content)
             
             print(f"✅ Generated: {output_file}")
             print(f"   Symbols: {len(self.isin_mapping)}")
@@ -348,49 +488,21 @@ if __name__ == "__main__":
         import random
         test_symbols = random.sample(list(self.isin_mapping.keys()), min(sample_size, len(self.isin_mapping)))
         
+        # Sampled keys go out in multi-symbol LTP requests (one for a typical
+        # sample); no per-symbol round trips or sleeps
+        results = asyncio.run(self._validate_symbols_async(token, test_symbols))
+        
         successful = 0
         failed = 0
         
-        for i, symbol in enumerate(test_symbols, 1):
+        for i, (symbol, ok, (icon, message)) in enumerate(results, 1):
             isin = self.isin_mapping[symbol]
-            instrument_key = f"NSE_EQ|{isin}"
-            
-            try:
-                response = requests.get(
-                    f"https://api.upstox.com/v2/market-quote/ltp?mode=LTP&symbol={instrument_key}",
-                    headers={"Authorization": f"Bearer {token}"},
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("status") == "success" and data.get("data"):
-                        # Check if we have LTP data
-                        has_ltp = False
-                        for key, val in data.get("data", {}).items():
-                            if isinstance(val, dict) and "last_price" in val:
-                                ltp = val["last_price"]
-                                print(f"✅ {i:2}/{sample_size} {symbol:20} (ISIN: {isin}) → LTP: ₹{ltp:.2f}")
-                                successful += 1
-                                has_ltp = True
-                                break
-                        
-                        if not has_ltp:
-                            print(f"⚠️  {i:2}/{sample_size} {symbol:20} (ISIN: {isin}) → No LTP in response")
-                            failed += 1
-                    else:
-                        print(f"❌ {i:2}/{sample_size} {symbol:20} (ISIN: {isin}) → API error: {data.get('message', 'Unknown')}")
-                        failed += 1
-                else:
-                    print(f"❌ {i:2}/{sample_size} {symbol:20} (ISIN: {isin}) → HTTP {response.status_code}")
-                    failed += 1
-                    
-            except Exception as e:
-                print(f"❌ {i:2}/{sample_size} {symbol:20} (ISIN: {isin}) → Error: {str(e)[:50]}")
+            progress(f"{icon} {i:2d}/{sample_size} {symbol:<20} (ISIN: {isin}) → {message}")
+            if ok:
+                successful += 1
+            else:
                 failed += 1
-            
-            # Small delay
-            time.sleep(0.2)
+        flush_progress()
         
         print()
         print(f"📊 Validation Results: {successful} passed, {failed} failed")
@@ -398,6 +510,70 @@ if __name__ == "__main__":
         
         return failed == 0
 
+    async def _validate_symbols_async(self, token: str, symbols: List[str],
+                                      batch_size: int = LTP_BATCH_SIZE,
+                                      max_concurrency: int = 10) -> List[Tuple[str, bool, Tuple[str, str]]]:
+        """
+        Fetch LTP for all symbols using multi-key requests
+        
+        Keys are sent comma-separated, batch_size per request; batches run
+        concurrently (bounded by max_concurrency) over one pooled client.
+        
+        Returns:
+            List of (symbol, ok, (icon, message)) in the same order as symbols
+        """
+        keys = [f"NSE_EQ|{self.isin_mapping[symbol]}" for symbol in symbols]
+        batches = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+        
+        sem = asyncio.Semaphore(max_concurrency)
+        headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+        
+        async with httpx.AsyncClient(headers=headers, timeout=10) as client:
+            batch_results = await asyncio.gather(
+                *(self._fetch_ltp_batch(client, sem, batch) for batch in batches)
+            )
+        
+        outcome: Dict[str, Tuple[bool, Tuple[str, str]]] = {}
+        for result in batch_results:
+            outcome.update(result)
+        
+        return [(symbol, *outcome[key]) for symbol, key in zip(symbols, keys)]
+    
+    async def _fetch_ltp_batch(self, client, sem: asyncio.Semaphore,
+                               keys: List[str]) -> Dict[str, Tuple[bool, Tuple[str, str]]]:
+        """Fetch LTP for a batch of instrument keys and describe each outcome"""
+        try:
+            async with sem:
+                response = await client.get(
+                    "https://api.upstox.com/v2/market-quote/ltp",
+                    params={"mode": "LTP", "symbol": ",".join(keys)}
+                )
+            if response.status_code != 200:
+                return dict.fromkeys(keys, (False, ("❌", f"HTTP {response.status_code}")))
+            data = json_loads(response.content)
+        except Exception as e:
+            return dict.fromkeys(keys, (False, ("❌", f"Error: {str(e)[:50]}")))
+        
+        if data.get("status") != "success" or not data.get("data"):
+            return dict.fromkeys(keys, (False, ("❌", f"API error: {data.get('message', 'Unknown')}")))
+        
+        # Response entries are keyed by exchange:symbol; match them back to
+        # the requested keys through instrument_token (NSE_EQ|ISIN)
+        by_token = {
+            val.get("instrument_token"): val
+            for val in data["data"].values()
+            if isinstance(val, dict)
+        }
+        
+        results = {}
+        for key in keys:
+            ltp = (by_token.get(key) or {}).get("last_price")
+            # null or non-numeric prices count as missing instead of raising
+            if isinstance(ltp, (int, float)) and not isinstance(ltp, bool):
+                results[key] = (True, ("✅", f"LTP: ₹{ltp:.2f}"))
+            else:
+                results[key] = (False, ("⚠️ ", "No LTP in response"))
+        return results
 
 def main():
     """Main execution"""
@@ -434,13 +610,9 @@ def main():
     print()
     
     try:
-        with open("backend/.env") as f:
-            for line in f:
-                if "UPSTOX_ACCESS_TOKEN=" in line:
-                    token = line.split('=')[1].strip()
-                    if token and token != "your_token_here":
-                        resolver.validate_with_api(token, sample_size=15)
-                    break
+        token = get_token()
+        if token and token != "your_token_here":
+            resolver.validate_with_api(token, sample_size=15)
     except Exception as e:
         print(f"⚠️  Could not read token: {e}")
     
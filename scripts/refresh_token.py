@@ -2,12 +2,103 @@
 """
 Quick script to refresh Upstox access token
 """
+import argparse
+import base64
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import os
+import sys
+import time
 from datetime import datetime
+from pathlib import Path
+
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    json_loads = json.loads
+
+# Tokens from previous runs, keyed by API key. Upstox tokens expire at
+# ~03:30 IST the next day, so the JWT 'exp' decides; the TTL is only a cap
+TOKEN_CACHE_PATH = Path.home() / ".kakarot" / "token_cache.json"
+TOKEN_CACHE_TTL = 23 * 3600  # seconds
+TOKEN_EXPIRY_MARGIN = 15 * 60  # seconds - don't hand out a token about to die
+
+
+def token_expiry(token: str):
+    """JWT 'exp' claim (epoch seconds), or None if it can't be read"""
+    try:
+        _, payload, _ = token.split('.')
+        # JWT segments are unpadded base64url ('-' and '_', not '+' and '/')
+        exp = json_loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4))).get('exp')
+    except (ValueError, AttributeError):
+        return None
+    return exp if isinstance(exp, (int, float)) else None
+
+
+def load_cached_token(api_key: str):
+    """Return a cached token for api_key unless it has expired (or is about to)"""
+    try:
+        cache = json_loads(TOKEN_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return None
+    # Anything unexpected in the file just means a fresh login
+    if not isinstance(cache, dict):
+        return None
+    entry = cache.get(api_key)
+    if not isinstance(entry, dict):
+        return None
+    ts = entry.get("ts")
+    token = entry.get("token")
+    if not isinstance(ts, (int, float)) or not isinstance(token, str):
+        return None
+    
+    now = time.time()
+    exp = token_expiry(token)
+    if exp is None or exp - now < TOKEN_EXPIRY_MARGIN or now - ts >= TOKEN_CACHE_TTL:
+        return None
+    return token
+
+
+def save_cached_token(api_key: str, token: str) -> None:
+    """Store token for api_key in the cache file (owner read/write only)"""
+    try:
+        cache = json_loads(TOKEN_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        cache = {}
+    if not isinstance(cache, dict):
+        cache = {}
+    cache[api_key] = {"token": token, "ts": time.time()}
+    
+    TOKEN_CACHE_PATH.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd = os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(json_dumps(cache))
+    os.chmod(TOKEN_CACHE_PATH, 0o600)
+
+
+parser = argparse.ArgumentParser(description="Refresh the Upstox access token")
+parser.add_argument("--force", action="store_true",
+                    help="Ignore the cached token and log in again")
+args = parser.parse_args()
 
 # Get these from your Upstox app
 API_KEY = input("Enter API Key: ").strip()
+
+cached_token = None if args.force else load_cached_token(API_KEY)
+if cached_token:
+    expires_at = datetime.fromtimestamp(token_expiry(cached_token))
+    print(f"\n✅ Using cached token (valid until {expires_at:%Y-%m-%d %H:%M})\n")
+    print("=" * 80)
+    print(f"ACCESS_TOKEN: {cached_token}")
+    print("=" * 80)
+    print("\nRun with --force to log in again.")
+    sys.exit(0)
+
 API_SECRET = input("Enter API Secret: ").strip()
 AUTH_CODE = input("Enter Auth Code from redirect URL: ").strip()
 
@@ -15,7 +106,7 @@ print("\n🔄 Refreshing Upstox access token...\n")
 
 # Step 1: Exchange auth code for token
 url = "https://api.upstox.com/v2/login/authorization/token"
-headers = {"Accept": "application/json"}
+headers = {"Accept": "application/json", "Content-Type": "application/json"}
 data = {
     "code": AUTH_CODE,
     "client_id": API_KEY,
@@ -23,14 +114,24 @@ data = {
     "redirect_uri": "https://localhost:8000/callback",
     "grant_type": "authorization_code"
 }
+REQUEST_TIMEOUT = 10  # seconds - fail fast instead of hanging on a stalled connection
 
 try:
-    response = requests.post(url, headers=headers, json=data)
-    result = response.json()
+    # Keep-alive session: one pooled connection, reused if this grows more calls
+    with requests.Session() as session:
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        # Body is pre-encoded bytes, so requests sends it as-is
+        response = session.post(url, headers=headers, data=json_dumps(data), timeout=REQUEST_TIMEOUT)
+    result = json_loads(response.content)
     
     if response.status_code == 200 and "access_token" in result:
         access_token = result["access_token"]
         
+        try:
+            save_cached_token(API_KEY, access_token)
+        except OSError as e:
+            print(f"⚠️  Could not cache token: {e}")
+        
         print("✅ Token refreshed successfully!\n")
         print("=" * 80)
         print(f"ACCESS_TOKEN: {access_token}")
@@ -1,8 +1,16 @@
 import asyncio
+import json
 import os
 from dotenv import load_dotenv
 import httpx
 
+try:
+    import orjson
+    json_dumps = orjson.dumps
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -24,8 +32,12 @@ async def send_test_notification():
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload, timeout=10.0)
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(
+                url,
+                content=json_dumps(payload),
+                headers={"Content-Type": "application/json"}
+            )
             if response.status_code == 200:
                 print("✅ Success! Check your Telegram.")
             else:
@@ -11,49 +11,219 @@ This script validates that ALL 208 FNO symbol ISINs are correct by:
 
 Usage:
     1. Ensure you have a FRESH Upstox access token in backend/.env
-    2. Run: python3 validate_all_isins.py
+    2. Run: python3 validate_all_isins.py  (--force to ignore today's cache)
     3. Check the results - all 208 symbols should return LTP data
 
 If this script succeeds (208/208 working), our ISIN mapping is correct
 and the app can use these ISINs for all LTP and options fetching.
 """
 
+import argparse
+import asyncio
+import functools
 import json
-import urllib.request
-import urllib.parse
+import math
+import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from collections import Counter, defaultdict
+
+try:
+    import orjson
+    json_loads = orjson.loads
+    
+    def json_dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    json_loads = json.loads
+    
+    def json_dumps_pretty(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    from dotenv import dotenv_values
+    DOTENV_AVAILABLE = True
+except ImportError:
+    DOTENV_AVAILABLE = False
 
 # Setup paths
 ROOT = Path(__file__).resolve().parent.parent
 DATA_PATH = ROOT / 'backend' / 'src' / 'data'
+ENV_PATH = ROOT / 'backend' / '.env'
 sys.path.insert(0, str(DATA_PATH))
 
 # Import ISIN mapping
 try:
-    from isin_mapping_hardcoded import ISIN_MAPPING, get_instrument_key, get_all_symbols
+    from isin_mapping_hardcoded import ISIN_MAPPING, INSTRUMENT_KEY_MAPPING, get_all_symbols
     print(f"✅ Loaded ISIN mapping with {len(ISIN_MAPPING)} symbols")
 except ImportError as e:
     print(f"❌ Could not import ISIN mapping: {e}")
     print("   Run fetch_isins_complete.py first to generate the mapping")
     sys.exit(1)
 
+# Symbols kept per error type for the report; the full list is in 'failed'
+ERROR_SAMPLE_SIZE = 5
+PROGRESS_FLUSH_EVERY = 20  # Symbols between progress writes
+
+# Symbols validated earlier the same trading day are not re-requested; kept
+# out of the repo, next to the instruments cache from fetch_isins_complete.py
+VALIDATION_CACHE_FILE = Path.home() / '.cache' / 'kakarot' / 'isin_validation_cache.json'
+IST = timezone(timedelta(hours=5, minutes=30))
+
+LTP_URL = "https://api.upstox.com/v3/market-quote/ltp"
+PROFILE_URL = "https://api.upstox.com/v2/user/profile"
+
+# Keep-alive session: every request after the first reuses the pooled
+# connection to api.upstox.com instead of a fresh TCP + TLS handshake
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=64, max_retries=0))
+_SESSION.headers.update({'Accept': 'application/json'})
+
+# Cap on requests in flight at once, across batch and single-symbol calls
+MAX_CONCURRENT_REQUESTS = 16
+_SEM = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Upstox standard API limit is 50 req/s; stay under it with some headroom
+RATE_LIMIT_PER_SEC = 25
+MAX_RETRIES = 3  # Retries after HTTP 429
+BACKOFF_BASE = 0.5  # seconds, doubled per attempt when there is no Retry-After
+BACKOFF_MAX = 8.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket - only waits when the request rate is over the limit"""
+    
+    def __init__(self, rate_per_sec: float, burst: int):
+        self.rate = rate_per_sec
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _take(self) -> float:
+        """Take a token if one is available; otherwise return how long until one is"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+    
+    def acquire(self):
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+
+
+_BUCKET = TokenBucket(RATE_LIMIT_PER_SEC, burst=RATE_LIMIT_PER_SEC)
+
+
+def _auth(token: str) -> dict:
+    return {'Authorization': f'Bearer {token}'}
+
+
+def _retry_after(headers, attempt: int) -> float:
+    """Seconds to wait after a 429: the server's Retry-After, else exponential backoff"""
+    try:
+        return float(headers['Retry-After'])
+    except (KeyError, ValueError):
+        return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+
+
+def _get_ltp(instrument_keys: str, token: str, read_timeout: float) -> requests.Response:
+    """Rate-limited LTP request, retried on HTTP 429"""
+    for attempt in range(MAX_RETRIES + 1):
+        _BUCKET.acquire()
+        with _SEM:
+            resp = _SESSION.get(
+                LTP_URL,
+                params={'instrument_key': instrument_keys},
+                headers=_auth(token),
+                timeout=(5, read_timeout)
+            )
+        if resp.status_code != 429 or attempt == MAX_RETRIES:
+            return resp
+        # Sleep outside the semaphore so other workers keep going
+        time.sleep(_retry_after(resp.headers, attempt))
+
+
+def _error_message(content: bytes, reason: str) -> str:
+    """Upstox error message from a non-200 response body, falling back to the reason"""
+    try:
+        return json_loads(content).get('message', reason)
+    except ValueError:
+        return reason
+
+
+def _entries_by_instrument_key(payload: dict) -> dict:
+    """
+    Re-key an LTP response 'data' dict by requested instrument key
+    
+    Entries come back keyed NSE_EQ:SYMBOL, which need not match our symbol;
+    the NSE_EQ|ISIN key that was requested is echoed in instrument_token.
+    Single and batch lookups both go through here so they can't disagree.
+    """
+    return {
+        entry.get('instrument_token', key): entry
+        for key, entry in payload.items()
+        if isinstance(entry, dict)
+    }
+
+
+def _parse_batch_response(status: int, content: bytes, reason: str) -> tuple:
+    """(response 'data' dict, error_msg) from a raw LTP batch response"""
+    if status != 200:
+        return {}, f"HTTP {status}: {_error_message(content, reason)}"
+    try:
+        data = json_loads(content)
+    except ValueError as e:
+        return {}, str(e)[:50]
+    
+    if data.get('status') != 'success':
+        return {}, f"API error: {data.get('message', 'Unknown')}"
+    
+    return data.get('data', {}), None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> dict:
+    """Parse backend/.env once; later calls reuse the dict"""
+    if DOTENV_AVAILABLE:
+        return dotenv_values(ENV_PATH)
+    env = {}
+    for line in ENV_PATH.read_text().splitlines():
+        key, sep, value = line.partition('=')
+        if sep and not key.lstrip().startswith('#'):
+            # partition keeps any '=' inside the value intact
+            env[key.strip()] = value.strip().strip('"\'')
+    return env
+
 
 def load_access_token() -> str:
     """Load access token from .env file"""
-    env_path = ROOT / 'backend' / '.env'
-    if not env_path.exists():
+    if not ENV_PATH.exists():
         print("❌ backend/.env file not found")
         sys.exit(1)
     
-    for line in env_path.read_text().splitlines():
-        if line.startswith('UPSTOX_ACCESS_TOKEN='):
-            token = line.split('=', 1)[1].strip()
-            if token and token != 'your_token_here':
-                return token
+    token = _load_env().get('UPSTOX_ACCESS_TOKEN', '')
+    if token and token != 'your_token_here':
+        return token
     
     print("❌ No valid UPSTOX_ACCESS_TOKEN found in backend/.env")
     sys.exit(1)
@@ -64,8 +234,8 @@ def check_token_validity(token: str) -> bool:
     import base64
     try:
         _, payload, _ = token.split('.')
-        payload += '=' * (4 - len(payload) % 4)
-        data = json.loads(base64.b64decode(payload))
+        # JWT segments are unpadded base64url ('-' and '_', not '+' and '/')
+        data = json_loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
         
         exp_time = data.get('exp', 0)
         current_time = int(time.time())
@@ -89,41 +259,91 @@ def check_token_validity(token: str) -> bool:
         return True  # Proceed anyway
 
 
-def fetch_ltp_batch(symbols: list, token: str) -> dict:
+def probe_token(token: str) -> bool:
+    """
+    One-shot authenticated call before the symbol loop
+    
+    The JWT expiry check can't tell a revoked token from a live one; without
+    this probe an invalid token costs one failed request per symbol.
+    """
+    try:
+        resp = _SESSION.get(PROFILE_URL, headers=_auth(token), timeout=5)
+    except requests.RequestException as e:
+        print(f"⚠️  Could not reach Upstox API: {e}")
+        return True  # Proceed anyway
+    
+    if resp.status_code == 401:
+        print("❌ Token rejected by Upstox API (HTTP 401)")
+        return False
+    if resp.status_code != 200:
+        print(f"⚠️  Profile probe returned HTTP {resp.status_code}: {resp.reason}")
+        return True  # Not an auth failure - let the LTP calls report it
+    
+    print("✅ Token accepted by Upstox API")
+    return True
+
+
+def fetch_ltp_batch(symbols: list, token: str) -> tuple:
     """
     Fetch LTP for multiple symbols in one API call (up to 500)
     
     Uses Upstox v3 API which supports comma-separated instrument keys
+    
+    Returns: (response 'data' dict, error_msg)
     """
-    # Build comma-separated instrument keys
-    instrument_keys = []
-    for sym in symbols:
-        key = get_instrument_key(sym)
-        if key:
-            instrument_keys.append(key)
+    # Precomputed NSE_EQ|ISIN keys; symbols without an ISIN are skipped
+    instrument_keys = [key for key in map(INSTRUMENT_KEY_MAPPING.get, symbols) if key]
     
     if not instrument_keys:
-        return {}
+        return {}, None
     
-    # URL encode the comma-separated keys
-    keys_param = ','.join(instrument_keys)
-    url = f"https://api.upstox.com/v3/market-quote/ltp?instrument_key={urllib.parse.quote(keys_param)}"
+    try:
+        resp = _get_ltp(','.join(instrument_keys), token, read_timeout=30)
+    except requests.RequestException as e:
+        return {}, str(e)[:50]
     
-    req = urllib.request.Request(url, headers={
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json',
-        'Accept': 'application/json'
-    })
+    return _parse_batch_response(resp.status_code, resp.content, resp.reason)
+
+
+async def _fetch_ltp_batch_async(session, sem: asyncio.Semaphore, symbols: list, token: str) -> tuple:
+    """
+    aiohttp counterpart of fetch_ltp_batch, sharing its rate limiter and retries
     
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode())
-            if data.get('status') == 'success':
-                return data.get('data', {})
-    except Exception as e:
-        print(f"⚠️  Batch request failed: {e}")
+    Returns: (response 'data' dict, error_msg)
+    """
+    instrument_keys = [key for key in map(INSTRUMENT_KEY_MAPPING.get, symbols) if key]
+    
+    if not instrument_keys:
+        return {}, None
     
-    return {}
+    params = {'instrument_key': ','.join(instrument_keys)}
+    try:
+        for attempt in range(MAX_RETRIES + 1):
+            await _BUCKET.acquire_async()
+            async with sem:
+                async with session.get(LTP_URL, params=params, headers=_auth(token)) as resp:
+                    status, reason, headers = resp.status, resp.reason, resp.headers
+                    content = await resp.read()
+            if status != 429 or attempt == MAX_RETRIES:
+                break
+            await asyncio.sleep(_retry_after(headers, attempt))
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return {}, str(e)[:50] or type(e).__name__
+    
+    return _parse_batch_response(status, content, reason)
+
+
+async def _fetch_batches_async(chunks: list, token: str) -> list:
+    """Fetch all batches concurrently on one keep-alive aiohttp session"""
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    connector = aiohttp.TCPConnector(limit_per_host=32, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=30, connect=5)
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, headers={'Accept': 'application/json'}
+    ) as session:
+        return await asyncio.gather(
+            *(_fetch_ltp_batch_async(session, sem, chunk, token) for chunk in chunks)
+        )
 
 
 def fetch_ltp_single(symbol: str, token: str) -> tuple:
@@ -132,63 +352,95 @@ def fetch_ltp_single(symbol: str, token: str) -> tuple:
     
     Returns: (ltp, volume, error_msg)
     """
-    instrument_key = get_instrument_key(symbol)
+    instrument_key = INSTRUMENT_KEY_MAPPING.get(symbol)
     if not instrument_key:
         return None, None, "No ISIN mapping"
     
-    url = f"https://api.upstox.com/v3/market-quote/ltp?instrument_key={urllib.parse.quote(instrument_key)}"
+    try:
+        resp = _get_ltp(instrument_key, token, read_timeout=10)
+        if resp.status_code != 200:
+            return None, None, f"HTTP {resp.status_code}: {_error_message(resp.content, resp.reason)}"
+        data = json_loads(resp.content)
+    except (requests.RequestException, ValueError) as e:
+        return None, None, str(e)[:50]
     
-    req = urllib.request.Request(url, headers={
-        'Authorization': f'Bearer {token}',
-        'Content-Type': 'application/json',
-        'Accept': 'application/json'
-    })
+    if data.get('status') != 'success':
+        return None, None, f"API error: {data.get('message', 'Unknown')}"
+    
+    payload = data.get('data', {})
+    
+    # No entry for our instrument_token is a schema change worth reporting
+    entry = _entries_by_instrument_key(payload).get(instrument_key)
+    if entry is None:
+        return None, None, "instrument_key missing in response"
+    
+    ltp = entry.get('last_price')
+    volume = entry.get('volume')
+    
+    if ltp is not None:
+        return ltp, volume, None
+    else:
+        return None, None, "No last_price in response"
+
+
+def load_validation_cache(today: str) -> dict:
+    """
+    symbol -> {isin, ltp, volume} validated earlier on `today`
     
+    The cache only saves work: a missing, stale or malformed file (or entry)
+    is treated as empty (or skipped) and never stops validation.
+    """
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode())
-            
-            if data.get('status') != 'success':
-                return None, None, f"API error: {data.get('message', 'Unknown')}"
-            
-            payload = data.get('data', {})
-            
-            # Try to find our instrument key in response
-            if instrument_key in payload:
-                entry = payload[instrument_key]
-            else:
-                # Try first entry
-                entry = next(iter(payload.values()), {})
-            
-            ltp = entry.get('last_price')
-            volume = entry.get('volume')
-            
-            if ltp is not None:
-                return ltp, volume, None
-            else:
-                return None, None, "No last_price in response"
-                
-    except urllib.error.HTTPError as e:
-        error_body = ""
-        try:
-            error_body = e.read().decode()
-            error_data = json.loads(error_body)
-            return None, None, f"HTTP {e.code}: {error_data.get('message', e.reason)}"
-        except:
-            return None, None, f"HTTP {e.code}: {e.reason}"
-    except Exception as e:
-        return None, None, str(e)[:50]
+        cache = json_loads(VALIDATION_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(cache, dict) or cache.get('date') != today:
+        return {}
+    symbols = cache.get('symbols')
+    if not isinstance(symbols, dict):
+        return {}
+    
+    return {
+        symbol: entry for symbol, entry in symbols.items()
+        if isinstance(entry, dict)
+        and isinstance(entry.get('ltp'), (int, float)) and not isinstance(entry['ltp'], bool)
+    }
+
+
+def save_validation_cache(cache: dict):
+    try:
+        VALIDATION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        VALIDATION_CACHE_FILE.write_bytes(json_dumps_pretty(cache))
+    except OSError as e:
+        print(f"⚠️  Could not save validation cache: {e}")
 
 
-def validate_all_symbols(token: str, batch_size: int = 50) -> dict:
+def validate_all_symbols(token: str, batch_size: int = 50, force: bool = False) -> dict:
     """
     Validate all 208 symbols by fetching LTP
     
+    Symbols that already validated today (IST) with the same ISIN are taken
+    from the cache file unless force is set.
+    
     Returns dict with results
     """
     all_symbols = get_all_symbols()
     total = len(all_symbols)
     
+    today = datetime.now(IST).date().isoformat()
+    cache = {} if force else load_validation_cache(today)
+    cached = {
+        symbol: entry for symbol, entry in cache.items()
+        if entry.get('isin') == ISIN_MAPPING.get(symbol)
+    }
+    
+    # Reverse map built once, so each response entry resolves to its symbol
+    # in O(1) instead of a lookup per requested symbol
+    key_to_symbol = {key: symbol for symbol, key in INSTRUMENT_KEY_MAPPING.items()}
+    to_fetch = [s for s in all_symbols if s in INSTRUMENT_KEY_MAPPING and s not in cached]
+    no_key = [symbol for symbol in all_symbols if symbol not in INSTRUMENT_KEY_MAPPING]
+    
     print(f"\n{'='*80}")
     print(f"🧪 VALIDATING {total} SYMBOLS AGAINST UPSTOX LTP API")
     print(f"{'='*80}\n")
@@ -196,40 +448,109 @@ def validate_all_symbols(token: str, batch_size: int = 50) -> dict:
     results = {
         'success': [],
         'failed': [],
-        'errors': defaultdict(list)
+        'error_counts': Counter(),
+        'errors': defaultdict(list)  # error -> first ERROR_SAMPLE_SIZE symbols
     }
     
     start_time = time.time()
     
-    # Process symbols one by one for detailed error tracking
-    for i, symbol in enumerate(all_symbols, 1):
-        isin = ISIN_MAPPING.get(symbol)
-        ltp, volume, error = fetch_ltp_single(symbol, token)
-        
+    # Progress lines are buffered and written every PROGRESS_FLUSH_EVERY
+    # symbols with one stdout write instead of a print per line
+    progress = []
+    
+    def flush_progress():
+        if progress:
+            sys.stdout.write('\n'.join(progress) + '\n')
+            progress.clear()
+    
+    def record(i: int, symbol: str, ltp, volume, error):
         if error:
             results['failed'].append(symbol)
-            results['errors'][error].append(symbol)
-            status = f"❌ ERROR: {error}"
+            results['error_counts'][error] += 1
+            if len(results['errors'][error]) < ERROR_SAMPLE_SIZE:
+                results['errors'][error].append(symbol)
         else:
             results['success'].append((symbol, ltp, volume))
-            status = f"✅ LTP: ₹{ltp:,.2f}"
         
-        # Progress output
+        # Progress output - the line is only formatted when it is printed
         if i <= 10 or i % 20 == 0 or i == total:
-            print(f"[{i:3}/{total}] {symbol:15} (ISIN: {isin}) → {status}")
+            status = f"❌ ERROR: {error}" if error else f"✅ LTP: ₹{ltp:,.2f}"
+            progress.append(f"[{i:3}/{total}] {symbol:15} (ISIN: {ISIN_MAPPING.get(symbol)}) → {status}")
+        if i % PROGRESS_FLUSH_EVERY == 0 or i == total:
+            flush_progress()
+    
+    # One request per batch_size symbols instead of one per symbol; all
+    # batches are in flight together (aiohttp when installed, else the thread
+    # pool) and both gather() and map() hand results back in order
+    chunks = [to_fetch[offset:offset + batch_size] for offset in range(0, len(to_fetch), batch_size)]
+    
+    # Symbols without an instrument key fail up front, without a request
+    i = 0
+    for symbol in no_key:
+        i += 1
+        record(i, symbol, None, None, "No ISIN mapping")
+    
+    if cached:
+        flush_progress()
+        print(f"♻️  {len(cached)} symbols already validated today (use --force to recheck)")
+        for symbol in all_symbols:
+            if symbol in cached:
+                i += 1
+                record(i, symbol, cached[symbol]['ltp'], cached[symbol].get('volume'), None)
+    
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+        if AIOHTTP_AVAILABLE:
+            batch_results = asyncio.run(_fetch_batches_async(chunks, token))
+        else:
+            batch_results = pool.map(lambda chunk: fetch_ltp_batch(chunk, token), chunks)
         
-        # Rate limiting - small delay between requests
-        if i % 5 == 0:
-            time.sleep(0.2)
+        for n, (chunk, (entries, batch_error)) in enumerate(zip(chunks, batch_results), 1):
+            if batch_error:
+                # Upstox rejects the whole batch if any key is bad - retry this
+                # chunk symbol by symbol so the failure is pinned to a symbol
+                flush_progress()
+                print(f"⚠️  Batch {n} failed ({batch_error}), retrying individually")
+                singles = pool.map(lambda symbol: fetch_ltp_single(symbol, token), chunk)
+                for symbol, outcome in zip(chunk, singles):
+                    i += 1
+                    record(i, symbol, *outcome)
+                continue
+            
+            found = {}
+            for instrument_key, entry in _entries_by_instrument_key(entries).items():
+                symbol = key_to_symbol.get(instrument_key)
+                if symbol:
+                    found[symbol] = entry
+            
+            for symbol in chunk:
+                i += 1
+                entry = found.get(symbol)
+                if entry is None:
+                    record(i, symbol, None, None, "Missing from batch response")
+                elif entry.get('last_price') is None:
+                    record(i, symbol, None, None, "No last_price in response")
+                else:
+                    record(i, symbol, entry['last_price'], entry.get('volume'), None)
     
     elapsed = time.time() - start_time
     
+    # Only today's successes are kept, so failures are always retried
+    save_validation_cache({
+        'date': today,
+        'symbols': {
+            symbol: {'isin': ISIN_MAPPING.get(symbol), 'ltp': ltp, 'volume': volume}
+            for symbol, ltp, volume in results['success']
+        }
+    })
+    
     return {
         'success': results['success'],
         'failed': results['failed'],
+        'error_counts': results['error_counts'],
         'errors': dict(results['errors']),
         'total': total,
-        'elapsed': elapsed
+        'elapsed': elapsed,
+        'finished_at': datetime.now()  # one clock read shared by report and files
     }
 
 
@@ -244,7 +565,7 @@ def generate_report(results: dict) -> str:
     report.append("\n" + "="*80)
     report.append("📊 ISIN VALIDATION REPORT")
     report.append("="*80)
-    report.append(f"\nTimestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report.append(f"\nTimestamp: {results['finished_at'].strftime('%Y-%m-%d %H:%M:%S')}")
     report.append(f"Total Symbols: {total}")
     report.append(f"✅ Successful: {success_count} ({success_count/total*100:.1f}%)")
     report.append(f"❌ Failed: {failed_count} ({failed_count/total*100:.1f}%)")
@@ -256,23 +577,32 @@ def generate_report(results: dict) -> str:
         report.append("📈 LTP STATISTICS (Successful Symbols)")
         report.append("-"*80)
         
-        ltps = [ltp for _, ltp, _ in results['success'] if ltp]
-        if ltps:
-            report.append(f"Min LTP: ₹{min(ltps):,.2f}")
-            report.append(f"Max LTP: ₹{max(ltps):,.2f}")
-            report.append(f"Avg LTP: ₹{sum(ltps)/len(ltps):,.2f}")
-    
-    if results['errors']:
+        # Min/max/sum in one pass over the successes
+        min_ltp, max_ltp, ltp_sum, ltp_count = math.inf, -math.inf, 0.0, 0
+        for _, ltp, _ in results['success']:
+            if ltp:
+                if ltp < min_ltp:
+                    min_ltp = ltp
+                if ltp > max_ltp:
+                    max_ltp = ltp
+                ltp_sum += ltp
+                ltp_count += 1
+        if ltp_count:
+            report.append(f"Min LTP: ₹{min_ltp:,.2f}")
+            report.append(f"Max LTP: ₹{max_ltp:,.2f}")
+            report.append(f"Avg LTP: ₹{ltp_sum/ltp_count:,.2f}")
+    
+    if results['error_counts']:
         report.append("\n" + "-"*80)
         report.append("❌ ERRORS BY TYPE")
         report.append("-"*80)
         
-        for error_type, symbols in sorted(results['errors'].items(), key=lambda x: -len(x[1])):
-            report.append(f"\n[{len(symbols)} symbols] {error_type}:")
-            for sym in symbols[:5]:
+        for error_type, count in results['error_counts'].most_common():
+            report.append(f"\n[{count} symbols] {error_type}:")
+            for sym in results['errors'][error_type]:
                 report.append(f"   • {sym}")
-            if len(symbols) > 5:
-                report.append(f"   ... and {len(symbols)-5} more")
+            if count > ERROR_SAMPLE_SIZE:
+                report.append(f"   ... and {count - ERROR_SAMPLE_SIZE} more")
     
     if success_count == total:
         report.append("\n" + "="*80)
@@ -298,60 +628,74 @@ def generate_report(results: dict) -> str:
 
 def save_results(results: dict, report: str):
     """Save results to files"""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    now = results['finished_at']
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
     
     # Save detailed JSON results
     json_file = ROOT / f'isin_validation_results_{timestamp}.json'
-    with open(json_file, 'w') as f:
-        json.dump({
-            'timestamp': timestamp,
-            'total': results['total'],
-            'success_count': len(results['success']),
-            'failed_count': len(results['failed']),
-            'success': [(s, ltp, vol) for s, ltp, vol in results['success']],
-            'failed': results['failed'],
-            'errors': results['errors']
-        }, f, indent=2)
+    json_file.write_bytes(json_dumps_pretty({
+        'timestamp': timestamp,
+        'total': results['total'],
+        'success_count': len(results['success']),
+        'failed_count': len(results['failed']),
+        'success': [(s, ltp, vol) for s, ltp, vol in results['success']],
+        'failed': results['failed'],
+        'error_counts': dict(results['error_counts']),
+        'errors': results['errors']
+    }))
     print(f"\n📄 JSON results saved to: {json_file}")
     
     # Save text report
     report_file = ROOT / f'isin_validation_report_{timestamp}.txt'
-    with open(report_file, 'w') as f:
-        f.write(report)
+    report_file.write_text(report)
     print(f"📄 Report saved to: {report_file}")
     
-    # Also save a summary file for quick reference
+    # Also save a summary file for quick reference - built in memory and
+    # written with a single call
+    success_count = len(results['success'])
+    if success_count == results['total']:
+        status = (
+            "## ✅ Status: ALL SYMBOLS VALIDATED\n\n"
+            "The ISIN mapping is correct. The application can use these ISINs for:\n"
+            "1. Fetching LTP at startup\n"
+            "2. Getting options chains\n"
+            "3. WebSocket subscriptions\n"
+        )
+    else:
+        status = (
+            "## ⚠️ Status: PARTIAL SUCCESS\n\n"
+            "Some symbols failed. Check the detailed report for issues.\n"
+        )
+    sample_rows = "".join(
+        f"| {sym} | {ltp:,.2f} | {f'{vol:,}' if vol else 'N/A'} |\n"
+        for sym, ltp, vol in results['success'][:10]
+    )
+    
     summary_file = ROOT / 'ISIN_VALIDATION_SUMMARY.md'
-    with open(summary_file, 'w') as f:
-        f.write(f"# ISIN Validation Summary\n\n")
-        f.write(f"**Last Run**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        f.write(f"## Results\n")
-        f.write(f"- **Total Symbols**: {results['total']}\n")
-        f.write(f"- **Successful**: {len(results['success'])}\n")
-        f.write(f"- **Failed**: {len(results['failed'])}\n")
-        f.write(f"- **Success Rate**: {len(results['success'])/results['total']*100:.1f}%\n\n")
-        
-        if len(results['success']) == results['total']:
-            f.write("## ✅ Status: ALL SYMBOLS VALIDATED\n\n")
-            f.write("The ISIN mapping is correct. The application can use these ISINs for:\n")
-            f.write("1. Fetching LTP at startup\n")
-            f.write("2. Getting options chains\n")
-            f.write("3. WebSocket subscriptions\n")
-        else:
-            f.write("## ⚠️ Status: PARTIAL SUCCESS\n\n")
-            f.write("Some symbols failed. Check the detailed report for issues.\n")
-        
-        f.write(f"\n## Sample Successful LTPs\n\n")
-        f.write("| Symbol | LTP (₹) | Volume |\n")
-        f.write("|--------|---------|--------|\n")
-        for sym, ltp, vol in results['success'][:10]:
-            vol_str = f"{vol:,}" if vol else "N/A"
-            f.write(f"| {sym} | {ltp:,.2f} | {vol_str} |\n")
+    summary_file.write_text(
+        f"# ISIN Validation Summary\n\n"
+        f"**Last Run**: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        f"## Results\n"
+        f"- **Total Symbols**: {results['total']}\n"
+        f"- **Successful**: {success_count}\n"
+        f"- **Failed**: {len(results['failed'])}\n"
+        f"- **Success Rate**: {success_count/results['total']*100:.1f}%\n\n"
+        f"{status}"
+        f"\n## Sample Successful LTPs\n\n"
+        "| Symbol | LTP (₹) | Volume |\n"
+        "|--------|---------|--------|\n"
+        f"{sample_rows}"
+    )
     
     print(f"📄 Summary saved to: {summary_file}")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Validate all FNO ISINs against the Upstox LTP API")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-validate symbols that already passed today")
+    args = parser.parse_args()
+    
     print("="*80)
     print("🔍 UPSTOX ISIN VALIDATION TOOL")
     print("   Validates all 208 FNO symbols against Upstox LTP API")
@@ -367,8 +711,12 @@ def main():
         print("\n⚠️  Please update the token in backend/.env and run again")
         return 1
     
+    if not probe_token(token):
+        print("\n⚠️  Please update the token in backend/.env and run again")
+        return 1
+    
     print("\n📌 Step 3: Validating symbols...")
-    results = validate_all_symbols(token)
+    results = validate_all_symbols(token, force=args.force)
     
     print("\n📌 Step 4: Generating report...")
     report = generate_report(results)